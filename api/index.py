@@ -139,11 +139,12 @@ def get_period_summary():
     """Get period summary with demo data."""
     try:
         days = int(request.args.get('days', 30))
+        base_date = datetime.now()
 
         summary = {
             'period_days': days,
-            'start_date': (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d'),
-            'end_date': datetime.now().strftime('%Y-%m-%d'),
+            'start_date': (base_date - timedelta(days=days)).strftime('%Y-%m-%d'),
+            'end_date': base_date.strftime('%Y-%m-%d'),
             'total_cost': round(5500000 - random.uniform(100000, 300000), 2),
             'total_savings': round(380000 + random.uniform(50000, 100000), 2),
             'avg_daily_cost': round(183000 - random.uniform(5000, 10000), 2),
@@ -241,8 +242,9 @@ def get_daily_trends():
 def get_real_time_data():
     """Get real-time monitoring data with demo data."""
     try:
-        # Get current hour data
-        current_hour = datetime.now().hour
+        # Read the clock once so every row and the summary agree on "now"
+        base_date = datetime.now()
+        current_hour = base_date.hour
 
         # Generate hourly data for today
         hourly_data = []
@@ -266,7 +268,7 @@ def get_real_time_data():
 
             hourly_data.append({
                 'hour': hour,
-                'timestamp': datetime.now().replace(hour=hour, minute=0, second=0).isoformat(),
+                'timestamp': base_date.replace(hour=hour, minute=0, second=0).isoformat(),
                 'temperature_f': temperature,
                 'load_mw': load,
                 'electricity_price': price,
@@ -279,7 +281,7 @@ def get_real_time_data():
             'success': True,
             'real_time_data': {
                 'current_hour': current_hour,
-                'current_timestamp': datetime.now().isoformat(),
+                'current_timestamp': base_date.isoformat(),
                 'hourly_data': hourly_data,
                 'summary': {
                     'current_load_mw': hourly_data[current_hour]['load_mw'],
@@ -3,37 +3,172 @@
 Check actual database schema in Supabase
 """
 
-import sys
 import os
-from dotenv import load_dotenv
+import sys
+import argparse
+import json
+import tempfile
+import time
+
+TABLE_NAME = "optimization_results"
+SCHEMA_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "coolthecloud", "schema.json")
+
+# Bound str.format methods, so the format specs are parsed once per string
+# rather than rebuilt for every row.
+_COLUMN_ROW_FMT = "{:30} {:20} {}".format
+_INDEX_ROW_FMT = "{:30} {}".format
+
+
+def _load_cached_schema(key):
+    """Return cached schema rows for `key`, or None if missing, stale or for another key."""
+    ttl = float(os.getenv("SCHEMA_CACHE_TTL", 60))
+    try:
+        if time.time() - os.path.getmtime(SCHEMA_CACHE_PATH) > ttl:
+            return None
+        with open(SCHEMA_CACHE_PATH) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
 
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from data.api.store_to_postgres import connect_db
+    if cached.get("key") != key or "rows" not in cached:
+        return None
+    return [tuple(row) for row in cached["rows"]]
+
+
+def _store_cached_schema(key, rows):
+    """Atomically write schema rows to the cache."""
+    cache_dir = os.path.dirname(SCHEMA_CACHE_PATH)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"key": key, "rows": rows}, f)
+        os.replace(tmp_path, SCHEMA_CACHE_PATH)
+    except OSError as e:
+        print(f"Could not write schema cache: {e}")
+
+
+# Columns and indexes come back from one statement, tagged by kind, so
+# inspecting more of the table does not add round-trips. The statement reads
+# pg_catalog directly; information_schema.columns is a stack of views over
+# the same catalogs and is much slower to plan and execute.
+SCHEMA_LOOKUP_SQL = """
+SELECT
+    'column' AS kind,
+    a.attnum::int AS position,
+    a.attname::text AS name,
+    format_type(a.atttypid, a.atttypmod) AS detail,
+    NOT a.attnotnull AS nullable
+FROM pg_attribute a
+WHERE a.attrelid = %(table_oid)s
+    AND a.attnum > 0
+    AND NOT a.attisdropped
+UNION ALL
+SELECT
+    'index',
+    0,
+    ic.relname::text,
+    pg_get_indexdef(i.indexrelid),
+    NULL
+FROM pg_index i
+JOIN pg_class ic ON ic.oid = i.indexrelid
+WHERE i.indrelid = %(table_oid)s
+ORDER BY kind, position, name
+"""
+
+# Streamed straight to stdout by the server for --csv. COPY takes no bind
+# parameters, so the table name is composed in as a literal; the rendered
+# statement is kept per table (see _columns_copy_sql).
+COLUMNS_COPY_SQL = """
+COPY (
+    SELECT
+        a.attname AS column_name,
+        format_type(a.atttypid, a.atttypmod) AS data_type,
+        NOT a.attnotnull AS nullable
+    FROM pg_attribute a
+    WHERE a.attrelid = to_regclass(format('public.%I', {}))
+        AND a.attnum > 0
+        AND NOT a.attisdropped
+    ORDER BY a.attnum
+) TO STDOUT WITH (FORMAT CSV, HEADER)
+"""
+
+# Rendered COLUMNS_COPY_SQL text, by table name.
+_copy_sql_cache = {}
+
+
+def _columns_copy_sql(conn, table_name):
+    """Render the COPY statement for `table_name` once and reuse the text."""
+    if table_name not in _copy_sql_cache:
+        from psycopg2 import sql
+
+        query = sql.SQL(COLUMNS_COPY_SQL).format(sql.Literal(table_name))
+        _copy_sql_cache[table_name] = query.as_string(conn)
+    return _copy_sql_cache[table_name]
 
-load_dotenv()
 
 def check_schema():
-    conn = connect_db()
-    cur = conn.cursor()
+    # Deferred so importing this module stays cheap; store_to_postgres pulls
+    # in psycopg2 and the EIA fetcher (requests) and loads .env on import.
+    from data.api.store_to_postgres import get_conn
+
+    with get_conn() as conn, conn.cursor() as cur:
+        # Resolve the table to its OID once; the lookup then filters
+        # pg_attribute and pg_index by (attrelid, attnum) / indrelid index
+        # scans. pg_class.xmin changes whenever the relation's catalog row is
+        # rewritten (e.g. ALTER TABLE), but CREATE/DROP INDEX update that row
+        # in place, so the table's index OIDs are part of the cache key too.
+        cur.execute("""
+        SELECT
+            current_database(),
+            c.oid,
+            c.xmin::text,
+            ARRAY(SELECT i.indexrelid::bigint FROM pg_index i
+                  WHERE i.indrelid = c.oid ORDER BY 1)
+        FROM pg_class c
+        WHERE c.oid = to_regclass(format('public.%%I', %s));
+        """, (TABLE_NAME,))
+        row = cur.fetchone()
+        cache_key = [row[0], TABLE_NAME, row[2], row[3]] if row else None
 
-    # Check optimization_results columns
-    query = """
-    SELECT column_name, data_type, is_nullable
-    FROM information_schema.columns
-    WHERE table_name = 'optimization_results'
-    ORDER BY ordinal_position;
-    """
+        rows = _load_cached_schema(cache_key) if cache_key else None
+        if rows is None:
+            rows = []
+            if row:
+                cur.execute(SCHEMA_LOOKUP_SQL, {"table_oid": row[1]})
+                rows = cur.fetchall()
 
-    cur.execute(query)
-    columns = cur.fetchall()
+            if cache_key:
+                _store_cached_schema(cache_key, rows)
 
-    print("optimization_results table columns:")
-    print("-" * 50)
-    for col_name, data_type, nullable in columns:
-        print(f"{col_name:30} {data_type:20} {nullable}")
+    columns = [row[2:] for row in rows if row[0] == "column"]
+    indexes = [row[2:4] for row in rows if row[0] == "index"]
+
+    # Build the whole report first and emit it with a single write.
+    lines = [f"{TABLE_NAME} table columns:", "-" * 50]
+    lines += [
+        _COLUMN_ROW_FMT(col_name, data_type, "YES" if nullable else "NO")
+        for col_name, data_type, nullable in columns
+    ]
+    lines += ["", f"{TABLE_NAME} indexes:", "-" * 50]
+    lines += [_INDEX_ROW_FMT(index_name, definition) for index_name, definition in indexes]
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def dump_schema_csv():
+    """Write the table's columns to stdout as CSV via COPY, without per-row fetches."""
+    from data.api.store_to_postgres import get_conn
+
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.copy_expert(_columns_copy_sql(conn, TABLE_NAME), sys.stdout)
 
-    cur.close()
-    conn.close()
 
 if __name__ == "__main__":
-    check_schema()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Check the optimization_results schema in Supabase.")
+    parser.add_argument("--csv", action="store_true", help="Dump columns as CSV via COPY instead of the report")
+    args = parser.parse_args()
+
+    if args.csv:
+        dump_schema_csv()
+    else:
+        check_schema()
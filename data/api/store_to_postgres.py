@@ -2,10 +2,18 @@
 import os
 import sys
 import argparse
+import atexit
+import io
+import functools
+import threading
+import time
+import weakref
+from types import MappingProxyType
+from contextlib import contextmanager
 from datetime import datetime
 
 import psycopg2
-from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from psycopg2 import OperationalError as PsycopgOperationalError
 import socket
 from dotenv import load_dotenv
@@ -21,13 +29,13 @@ load_dotenv()
 AZ_BAS = {"AZPS", "SRP", "TEPC"}
 
 
-def connect_db():
-    dbname = os.getenv("PG_DB")
-    user = os.getenv("PG_USER")
-    password = os.getenv("PG_PASSWORD")
+@functools.cache
+def _connection_params():
+    """Resolve PG_* environment variables into psycopg2.connect() keyword arguments.
+
+    Resolved once per process (including the DNS check) and returned read-only.
+    """
     host = os.getenv("PG_HOST")
-    port = os.getenv("PG_PORT", 5432)
-    sslmode = os.getenv("PG_SSLMODE", "require")
 
     if not host:
         raise RuntimeError("PG_HOST environment variable is not set. Check your .env file or environment.")
@@ -36,14 +44,17 @@ def connect_db():
     if (host.startswith('"') and host.endswith('"')) or (host.startswith("'") and host.endswith("'")):
         host = host[1:-1]
 
+    # Session settings sent in the startup packet rather than as separate
+    # statements. PG_OPTIONS is opt-in (e.g. "-c jit=off"): connection
+    # poolers such as Supabase's can reject startup options.
+    session = {
+        "options": os.getenv("PG_OPTIONS"),
+        "application_name": os.getenv("PG_APPLICATION_NAME", "cooling-the-cloud"),
+    }
+    session = {key: value for key, value in session.items() if value}
+
     if "://" in host:
-        dsn = host
-        try:
-            return psycopg2.connect(dsn)
-        except PsycopgOperationalError as e:
-            print("Failed to connect using DSN provided in PG_HOST (treated as full connection URL).")
-            print("psycopg2 OperationalError:", e)
-            raise
+        return MappingProxyType({"dsn": host, **session})
 
     try:
         socket.gethostbyname(host)
@@ -53,34 +64,142 @@ def connect_db():
         print("Try: `nslookup <host>` or `dig <host> +short` from your shell.")
         raise
 
+    return MappingProxyType({
+        "dbname": os.getenv("PG_DB"),
+        "user": os.getenv("PG_USER"),
+        "password": os.getenv("PG_PASSWORD"),
+        "host": host,
+        "port": os.getenv("PG_PORT", 5432),
+        "sslmode": os.getenv("PG_SSLMODE", "require"),
+        **session,
+    })
+
+
+def _report_connect_error(params, e):
+    if "dsn" in params:
+        print("Failed to connect using DSN provided in PG_HOST (treated as full connection URL).")
+        print("psycopg2 OperationalError:", e)
+        return
+
+    masked_pwd = "***" if params["password"] else "(none)"
+    print("Failed to connect to Postgres. Connection parameters:")
+    print(f"  host={params['host']}")
+    print(f"  port={params['port']}")
+    print(f"  dbname={params['dbname']}")
+    print(f"  user={params['user']}")
+    print(f"  password={masked_pwd}")
+    print(f"  sslmode={params['sslmode']}")
+    print("")
+    print("psycopg2 OperationalError:", e)
+    print("Common causes:")
+    print(" - incorrect PG_HOST (typo or wrong project)")
+    print(" - network/DNS/VPN blocking name resolution")
+    print(" - firewall blocking outbound connections to the DB host/port")
+    print(" - database is paused or not publicly accessible (Supabase project settings)")
+
+
+def connect_db():
+    params = _connection_params()
     try:
-        return psycopg2.connect(
-            dbname=dbname,
-            user=user,
-            password=password,
-            host=host,
-            port=port,
-            sslmode=sslmode,
-        )
+        return psycopg2.connect(**params)
     except PsycopgOperationalError as e:
-        masked_pwd = "***" if password else "(none)"
-        print("Failed to connect to Postgres. Connection parameters:")
-        print(f"  host={host}")
-        print(f"  port={port}")
-        print(f"  dbname={dbname}")
-        print(f"  user={user}")
-        print(f"  password={masked_pwd}")
-        print(f"  sslmode={sslmode}")
-        print("")
-        print("psycopg2 OperationalError:", e)
-        print("Common causes:")
-        print(" - incorrect PG_HOST (typo or wrong project)")
-        print(" - network/DNS/VPN blocking name resolution")
-        print(" - firewall blocking outbound connections to the DB host/port")
-        print(" - database is paused or not publicly accessible (Supabase project settings)")
+        _report_connect_error(params, e)
         raise
 
 
+_pool = None
+_pool_slots = None
+_pool_lock = threading.Lock()
+
+# Pooled connections idle longer than this are probed before reuse; the
+# server or a pooler may have dropped them in the meantime.
+POOL_IDLE_CHECK_SECONDS = float(os.getenv("PG_POOL_IDLE_CHECK", 30))
+
+# When each pooled connection was last handed back.
+_returned_at = weakref.WeakKeyDictionary()
+
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool, _pool_slots
+    with _pool_lock:
+        if _pool is None or _pool.closed:
+            params = _connection_params()
+            size = int(os.getenv("PG_POOL_MAX", 4))
+            try:
+                # Connections open lazily: a one-query CLI pays for one
+                # handshake, not PG_POOL_MAX of them.
+                _pool = ThreadedConnectionPool(1, size, **params)
+            except PsycopgOperationalError as e:
+                _report_connect_error(params, e)
+                raise
+            # ThreadedConnectionPool raises PoolError instead of waiting when
+            # all connections are out; get_conn waits on this first.
+            _pool_slots = threading.BoundedSemaphore(size)
+        return _pool
+
+
+@atexit.register
+def _close_pool():
+    if _pool is not None and not _pool.closed:
+        _pool.closeall()
+
+
+def _is_alive(conn):
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        return False
+
+
+@contextmanager
+def get_conn():
+    """Borrow a pooled connection; it is returned (not closed) on exit.
+
+    Blocks until a connection is free. A connection that sat idle for more
+    than POOL_IDLE_CHECK_SECONDS is checked with SELECT 1 first, and replaced
+    with a fresh one if the server has dropped it.
+    """
+    pool = get_pool()
+    slots = _pool_slots
+    slots.acquire()
+    try:
+        conn = pool.getconn()
+        returned_at = _returned_at.get(conn)
+        if (returned_at is not None
+                and time.monotonic() - returned_at > POOL_IDLE_CHECK_SECONDS
+                and not _is_alive(conn)):
+            pool.putconn(conn, close=True)
+            conn = pool.getconn()
+        try:
+            yield conn
+        finally:
+            _returned_at[conn] = time.monotonic()
+            pool.putconn(conn)
+    finally:
+        slots.release()
+
+
+def _copy_csv_buffer(rows):
+    r"""Render rows as CSV for COPY ... WITH (FORMAT csv, NULL '\N').
+
+    None is written as an unquoted \N (NULL); every other value is quoted,
+    so an empty string stays '' and a literal '\N' string is not read as NULL.
+    """
+    buf = io.StringIO()
+    for row in rows:
+        buf.write(",".join(
+            r"\N" if v is None else '"' + str(v).replace('"', '""') + '"'
+            for v in row
+        ))
+        buf.write("\n")
+    buf.seek(0)
+    return buf
+
+
 def save_interchange(records):
     if not records:
         print("No records to insert.")
@@ -144,17 +263,19 @@ def save_interchange(records):
     CHUNK = 5000
     inserted = 0
 
-    print(f"[store_to_postgres] Beginning chunked insert of {total} rows...")
+    print(f"[store_to_postgres] Beginning chunked COPY of {total} rows...")
 
-    query = """
-        INSERT INTO eia_interchange
+    # COPY streams each chunk as one CSV payload instead of expanding it into
+    # a multi-row INSERT statement (see _copy_csv_buffer for NULL handling).
+    copy_sql = r"""
+        COPY eia_interchange
         (period, fromba, fromba_name, toba, toba_name, value, value_units)
-        VALUES %s
+        FROM STDIN WITH (FORMAT csv, NULL '\N')
     """
 
     for i in range(0, total, CHUNK):
         batch = rows[i:i+CHUNK]
-        execute_values(cur, query, batch)
+        cur.copy_expert(copy_sql, _copy_csv_buffer(batch))
         conn.commit()
 
         inserted += len(batch)
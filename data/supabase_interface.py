@@ -17,42 +17,67 @@ from decimal import Decimal
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from data.api.store_to_postgres import connect_db
+from data.api.store_to_postgres import get_conn, get_pool
+
+# Arizona time-of-use rates by hour of day ($/MWh)
+_TOU_RATES = np.full(24, 128.0)  # Off-peak day rate
+_TOU_RATES[np.r_[22:24, 0:6]] = 77  # Super off-peak night rate
+_TOU_RATES[15:20] = 167  # Summer peak rate, 3-8 PM
+
+# Interchange-based price multiplier by hour of day:
+# base + |interchange| / 10000 * slope
+_PRICE_MULT_BASE = np.full(24, 1.0)  # Mid-peak
+_PRICE_MULT_SLOPE = np.full(24, 0.15)
+_PRICE_MULT_BASE[np.r_[22:24, 0:6]] = 0.6  # Off-peak
+_PRICE_MULT_SLOPE[np.r_[22:24, 0:6]] = 0.1
+_PRICE_MULT_BASE[15:20] = 1.3  # Peak hours 3-8 PM
+_PRICE_MULT_SLOPE[15:20] = 0.2
+
+# get_period_summary result when there are no completed runs in the period
+_EMPTY_PERIOD_SUMMARY = {
+    'days_analyzed': 0,
+    'actual_days_with_data': 0,
+    'is_projection': False,
+    'total_savings': 0,
+    'avg_daily_savings': 0,
+    'avg_savings_percent': 0,
+    'total_water_usage': 0,
+    'avg_water_usage': 0,
+    'max_peak_demand': 0,
+    'avg_peak_demand': 0,
+    'total_carbon_avoided': 0
+}
 
 
 class SupabaseInterface:
-    """Production interface for Supabase database operations."""
+    """Production interface for Supabase database operations.
+
+    Instances hold no connection of their own: each method borrows one from
+    the process-wide pool in store_to_postgres and hands it back when done,
+    so creating an interface per optimizer run does not open a new session.
+    """
 
     def __init__(self):
         """Initialize Supabase connection."""
-        self.conn = None
         self.connect()
 
     def connect(self):
-        """Establish database connection."""
+        """Make sure the shared connection pool is up."""
         try:
-            self.conn = connect_db()
+            get_pool()
             print("✅ Connected to Supabase database")
         except Exception as e:
             print(f"❌ Failed to connect to Supabase: {e}")
             raise
 
     def test_connection(self) -> bool:
-        """Test if connection is active."""
+        """Test if the database is reachable."""
         try:
-            if self.conn:
-                cur = self.conn.cursor()
+            with get_conn() as conn, conn.cursor() as cur:
                 cur.execute("SELECT 1")
-                cur.close()
-                return True
-        except:
+            return True
+        except Exception:
             return False
-        return False
-
-    def ensure_connection(self):
-        """Ensure connection is active, reconnect if needed."""
-        if not self.test_connection():
-            self.connect()
 
     def fetch_weather_data(self, date: datetime, hours: int = 24) -> List[float]:
         """
@@ -65,38 +90,60 @@ class SupabaseInterface:
         Returns:
             List of hourly temperatures in Fahrenheit
         """
-        self.ensure_connection()
-
         # First try to get real weather data if available
-        try:
-            query = """
-            SELECT
-                EXTRACT(HOUR FROM timestamp) as hour,
-                AVG(temperature_f) as avg_temp
-            FROM weather_data
-            WHERE DATE(timestamp) = %s
-            GROUP BY EXTRACT(HOUR FROM timestamp)
-            ORDER BY hour
-            LIMIT %s
-            """
-
-            cur = self.conn.cursor()
-            cur.execute(query, (date.date(), hours))
-            results = cur.fetchall()
-            cur.close()
-
-            if results and len(results) > 0:
-                temperatures = [float(row[1]) for row in results]
-                # Pad with Phoenix pattern if not enough hours
-                while len(temperatures) < hours:
-                    temperatures.append(self._generate_phoenix_temp(len(temperatures)))
-                return temperatures[:hours]
-        except Exception as e:
-            print(f"Could not fetch weather data: {e}")
+        hourly = self.fetch_weather_data_range(date, date + timedelta(days=1)).get(date.date(), {})
+        measured = np.sort(np.fromiter((hour for hour in hourly if hour < hours), dtype=int))
+
+        if measured.size:
+            temps = np.array([hourly[hour] for hour in measured])
+            # Hours between the first and last reading are interpolated from
+            # the readings; hours outside that span (e.g. the rest of today)
+            # keep the Phoenix pattern.
+            filled = np.array(self._generate_phoenix_pattern(date, hours))
+            span = np.arange(measured[0], measured[-1] + 1)
+            filled[span] = np.interp(span, measured, temps)
+            return filled.tolist()
 
         # Fallback to realistic Phoenix pattern based on month
         return self._generate_phoenix_pattern(date, hours)
 
+    def fetch_weather_data_range(self, start: datetime, end: datetime) -> Dict:
+        """
+        Fetch hourly average temperatures for a range of days in one query.
+
+        Args:
+            start: First date to fetch
+            end: Date to stop before
+
+        Returns:
+            Dict mapping each date that has data to {hour: temperature}
+        """
+        days = {}
+
+        with get_conn() as conn:
+            try:
+                query = """
+                SELECT
+                    DATE(timestamp) as day,
+                    EXTRACT(HOUR FROM timestamp)::int as hour,
+                    AVG(temperature_f) as avg_temp
+                FROM weather_data
+                WHERE timestamp >= %s AND timestamp < %s
+                GROUP BY DATE(timestamp), EXTRACT(HOUR FROM timestamp)
+                ORDER BY day, hour
+                """
+
+                cur = conn.cursor()
+                cur.execute(query, (start.date(), end.date()))
+                for day, hour, avg_temp in cur.fetchall():
+                    if avg_temp is not None:
+                        days.setdefault(day, {})[hour] = float(avg_temp)
+                cur.close()
+            except Exception as e:
+                print(f"Could not fetch weather data: {e}")
+
+        return days
+
     def _generate_phoenix_pattern(self, date: datetime, hours: int = 24) -> List[float]:
         """Generate realistic Phoenix temperature pattern based on month."""
         month = date.month
@@ -119,23 +166,15 @@ class SupabaseInterface:
 
         high, low = monthly_temps.get(month, (95, 75))
 
-        temperatures = []
-        for hour in range(hours):
-            # Sine wave pattern with minimum at 5 AM, maximum at 5 PM
-            base = (high + low) / 2
-            amplitude = (high - low) / 2
-            phase = (hour - 5) * np.pi / 12
-            temp = base + amplitude * np.sin(phase - np.pi/2)
-            # Add slight random variation
-            temp += np.random.uniform(-2, 2)
-            temperatures.append(max(low - 5, min(high + 5, temp)))
-
-        return temperatures
+        # Sine wave pattern with minimum at 5 AM, maximum at 5 PM
+        base = (high + low) / 2
+        amplitude = (high - low) / 2
+        phase = (np.arange(hours) - 5) * np.pi / 12
+        temps = base + amplitude * np.sin(phase - np.pi/2)
+        # Add slight random variation
+        temps += np.random.uniform(-2, 2, size=hours)
 
-    def _generate_phoenix_temp(self, hour: int, month: int = 8) -> float:
-        """Generate single hour Phoenix temperature."""
-        pattern = self._generate_phoenix_pattern(datetime(2024, month, 1), 24)
-        return pattern[hour % 24]
+        return np.clip(temps, low - 5, high + 5).tolist()
 
     def get_electricity_prices(self, date: datetime, hours: int = 24) -> List[float]:
         """
@@ -148,107 +187,134 @@ class SupabaseInterface:
         Returns:
             List of hourly prices in $/MWh
         """
-        self.ensure_connection()
+        return self.get_electricity_prices_range(date, date + timedelta(days=1), hours)[date.date()]
 
-        # First check if we have direct price data
-        try:
-            query = """
-            SELECT
-                hour,
-                price_per_mwh
-            FROM electricity_prices
-            WHERE DATE(timestamp) = %s
-            ORDER BY hour
-            LIMIT %s
-            """
-
-            cur = self.conn.cursor()
-            cur.execute(query, (date.date(), hours))
-            results = cur.fetchall()
-            cur.close()
-
-            if results and len(results) >= hours:
-                return [float(row[1]) for row in results]
-        except:
-            pass
-
-        # Calculate prices from interchange data
-        try:
-            # Get Arizona average price
-            price_query = """
-            SELECT AVG(price_per_mwh) as avg_price
-            FROM eia_az_price
-            WHERE sectorid = 'ALL'
-            """
-
-            cur = self.conn.cursor()
-            cur.execute(price_query)
-            result = cur.fetchone()
-            base_price = float(result[0]) if result and result[0] else 128.4
-            cur.close()
-
-            # Get interchange patterns for price variation
-            interchange_query = """
-            SELECT
-                EXTRACT(HOUR FROM period) as hour,
-                AVG(value) as avg_interchange
-            FROM eia_interchange
-            WHERE DATE(period) = %s
-                AND (fromba IN ('AZPS', 'SRP', 'TEPC')
-                     OR toba IN ('AZPS', 'SRP', 'TEPC'))
-            GROUP BY EXTRACT(HOUR FROM period)
-            ORDER BY hour
-            """
-
-            cur = self.conn.cursor()
-            cur.execute(interchange_query, (date.date(),))
-            interchange_data = cur.fetchall()
-            cur.close()
-
-            # Generate prices based on interchange patterns
-            prices = []
-            for hour in range(hours):
-                # Find interchange for this hour
-                interchange = 0
-                for h, val in interchange_data:
-                    if int(h) == hour:
-                        interchange = float(val) if val else 0
-                        break
-
-                # Calculate price based on hour and interchange
-                if 15 <= hour < 20:  # Peak hours 3-8 PM
-                    price_mult = 1.3 + (abs(interchange) / 10000) * 0.2
-                elif hour >= 22 or hour < 6:  # Off-peak
-                    price_mult = 0.6 + (abs(interchange) / 10000) * 0.1
-                else:  # Mid-peak
-                    price_mult = 1.0 + (abs(interchange) / 10000) * 0.15
-
-                prices.append(base_price * price_mult)
-
-            return prices
+    def get_electricity_prices_range(self, start: datetime, end: datetime,
+                                     hours: int = 24) -> Dict:
+        """
+        Fetch or calculate hourly electricity prices for a range of days.
 
-        except Exception as e:
-            print(f"Error calculating prices from interchange: {e}")
+        Direct prices, the Arizona base price and the interchange profile are
+        each read with one query covering the whole range.
+
+        Args:
+            start: First date to fetch
+            end: Date to stop before
+            hours: Number of hours per day
+
+        Returns:
+            Dict mapping each date in the range to its hourly prices in $/MWh
+        """
+        first, last = start.date(), end.date()
+        days = [first + timedelta(days=i) for i in range((last - first).days)]
+        prices = {}
+
+        with get_conn() as conn:
+            # First check if we have direct price data
+            try:
+                query = """
+                SELECT
+                    DATE(timestamp) as day,
+                    price_per_mwh
+                FROM electricity_prices
+                WHERE timestamp >= %s AND timestamp < %s
+                    AND price_per_mwh IS NOT NULL
+                ORDER BY day, hour
+                """
+
+                cur = conn.cursor()
+                cur.execute(query, (first, last))
+                direct = {}
+                for day, price in cur.fetchall():
+                    direct.setdefault(day, []).append(float(price))
+                cur.close()
+
+                for day, day_prices in direct.items():
+                    if len(day_prices) >= hours:
+                        prices[day] = day_prices[:hours]
+            except psycopg2.Error:
+                # No usable electricity_prices table; clear the aborted
+                # transaction so the queries below can still run (a dead
+                # connection has nothing to roll back)
+                if not conn.closed:
+                    conn.rollback()
+
+            missing = [day for day in days if day not in prices]
+            if not missing:
+                return prices
+
+            # Calculate prices from interchange data
+            try:
+                # Get Arizona average price
+                price_query = """
+                SELECT AVG(price_per_mwh) as avg_price
+                FROM eia_az_price
+                WHERE sectorid = 'ALL'
+                """
+
+                cur = conn.cursor()
+                cur.execute(price_query)
+                result = cur.fetchone()
+                base_price = float(result[0]) if result and result[0] else 128.4
+                cur.close()
+
+                # Get interchange patterns for price variation
+                interchange_query = """
+                SELECT
+                    DATE(period) as day,
+                    EXTRACT(HOUR FROM period)::int as hour,
+                    AVG(value) as avg_interchange
+                FROM eia_interchange
+                WHERE period >= %s AND period < %s
+                    AND (fromba IN ('AZPS', 'SRP', 'TEPC')
+                         OR toba IN ('AZPS', 'SRP', 'TEPC'))
+                GROUP BY DATE(period), EXTRACT(HOUR FROM period)
+                ORDER BY day, hour
+                """
+
+                cur = conn.cursor()
+                cur.execute(interchange_query, (min(missing), max(missing) + timedelta(days=1)))
+                interchange_data = {}
+                for day, hour, val in cur.fetchall():
+                    interchange_data.setdefault(day, {})[hour] = float(val) if val else 0
+                cur.close()
+
+                for day in missing:
+                    prices[day] = self._interchange_prices(
+                        base_price, interchange_data.get(day, {}), hours
+                    )
+
+                return prices
+
+            except Exception as e:
+                print(f"Error calculating prices from interchange: {e}")
 
         # Fallback to time-of-use pattern with Arizona rates
-        return self._generate_tou_prices(hours)
+        for day in missing:
+            prices[day] = self._generate_tou_prices(hours)
+        return prices
+
+    def _interchange_prices(self, base_price: float, interchange_by_hour: Dict,
+                            hours: int = 24) -> List[float]:
+        """Generate hourly prices from the base price and an {hour: interchange} profile."""
+        # Hours past 23 keep the off-peak multiplier
+        hour = np.minimum(np.arange(hours), 23)
+        interchange = np.zeros(hours)
+        known = [h for h in interchange_by_hour if h < hours]
+        interchange[known] = [interchange_by_hour[h] for h in known]
+
+        # Calculate price based on hour and interchange
+        price_mult = _PRICE_MULT_BASE[hour] + (np.abs(interchange) / 10000) * _PRICE_MULT_SLOPE[hour]
+
+        return (base_price * price_mult).tolist()
 
     def _generate_tou_prices(self, hours: int = 24) -> List[float]:
         """Generate time-of-use prices based on Arizona rate structure."""
-        prices = []
-        for hour in range(hours):
-            if 15 <= hour < 20:  # Peak: 3-8 PM
-                price = 167  # Summer peak rate
-            elif hour >= 22 or hour < 6:  # Super off-peak
-                price = 77  # Night rate
-            else:  # Off-peak
-                price = 128  # Day rate
-
-            # Add small variation
-            price += np.random.uniform(-2, 2)
-            prices.append(price)
+        # Hours past 23 keep the night rate
+        prices = _TOU_RATES[np.minimum(np.arange(hours), 23)]
 
-        return prices
+        # Add small variation
+        return (prices + np.random.uniform(-2, 2, size=hours)).tolist()
 
     def get_water_prices(self, date: datetime) -> List[float]:
         """
@@ -260,36 +326,35 @@ class SupabaseInterface:
         Returns:
             List of 24 hourly water prices
         """
-        self.ensure_connection()
+        with get_conn() as conn:
+            try:
+                query = """
+                SELECT price_per_thousand_gallons, seasonal_multiplier
+                FROM water_prices
+                WHERE date <= %s
+                ORDER BY date DESC
+                LIMIT 1
+                """
+
+                cur = conn.cursor()
+                cur.execute(query, (date.date(),))
+                result = cur.fetchone()
+                cur.close()
 
-        try:
-            query = """
-            SELECT price_per_thousand_gallons, seasonal_multiplier
-            FROM water_prices
-            WHERE date <= %s
-            ORDER BY date DESC
-            LIMIT 1
-            """
-
-            cur = self.conn.cursor()
-            cur.execute(query, (date.date(),))
-            result = cur.fetchone()
-            cur.close()
-
-            if result:
-                base_price = float(result[0])
-                multiplier = float(result[1]) if result[1] else 1.0
-                price = base_price * multiplier
-            else:
-                # Default Phoenix water rate
-                price = 3.24
-
-            # Return same price for all hours
-            return [price] * 24
+                if result:
+                    base_price = float(result[0])
+                    multiplier = float(result[1]) if result[1] else 1.0
+                    price = base_price * multiplier
+                else:
+                    # Default Phoenix water rate
+                    price = 3.24
 
-        except Exception as e:
-            print(f"Error fetching water prices: {e}")
-            return [3.24] * 24  # Default rate
+                # Return same price for all hours
+                return [price] * 24
+
+            except Exception as e:
+                print(f"Error fetching water prices: {e}")
+                return [3.24] * 24  # Default rate
 
     def save_optimization_results(self, results: Dict) -> Optional[str]:
         """
@@ -301,93 +366,110 @@ class SupabaseInterface:
         Returns:
             Run ID if successful, None otherwise
         """
-        self.ensure_connection()
+        with get_conn() as conn:
+            try:
+                run_id = str(uuid.uuid4())
+                run_timestamp = datetime.now()
+
+                # Prepare data with proper type conversions
+                summary_data = {
+                    'run_id': run_id,
+                    'run_timestamp': run_timestamp,
+                    'run_name': f"Optimization {run_timestamp:%Y-%m-%d %H:%M}",
+                    'total_cost': float(results.get('total_cost', 0)),
+                    'electricity_cost': float(results.get('electricity_cost', 0)),
+                    'water_cost': float(results.get('water_cost', 0)),
+                    'baseline_cost': float(results.get('baseline_cost', 0)),
+                    'cost_savings': float(results.get('cost_savings', 0)),
+                    'cost_savings_percent': float(results.get('cost_savings_percent', 0)),
+                    'total_water_usage_gallons': float(results.get('total_water_gallons', 0)),
+                    'peak_demand_mw': float(results.get('peak_demand', 0)),
+                    'water_saved_gallons': float(results.get('water_saved', 0)),
+                    'carbon_avoided_tons': float(results.get('carbon_avoided', 0)),
+                    'optimization_status': 'completed'
+                }
 
-        try:
-            run_id = str(uuid.uuid4())
-
-            # Prepare data with proper type conversions
-            summary_data = {
-                'run_id': run_id,
-                'run_timestamp': datetime.now(),
-                'run_name': f"Optimization {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-                'total_cost': float(results.get('total_cost', 0)),
-                'electricity_cost': float(results.get('electricity_cost', 0)),
-                'water_cost': float(results.get('water_cost', 0)),
-                'baseline_cost': float(results.get('baseline_cost', 0)),
-                'cost_savings': float(results.get('cost_savings', 0)),
-                'cost_savings_percent': float(results.get('cost_savings_percent', 0)),
-                'total_water_usage_gallons': float(results.get('total_water_gallons', 0)),
-                'peak_demand_mw': float(results.get('peak_demand', 0)),
-                'water_saved_gallons': float(results.get('water_saved', 0)),
-                'carbon_avoided_tons': float(results.get('carbon_avoided', 0)),
-                'optimization_status': 'completed'
-            }
-
-            # Insert summary
-            summary_query = """
-            INSERT INTO optimization_summary (
-                run_id, run_timestamp, run_name,
-                total_cost, electricity_cost, water_cost,
-                baseline_cost, cost_savings, cost_savings_percent,
-                total_water_usage_gallons, peak_demand_mw,
-                water_saved_gallons, carbon_avoided_tons,
-                optimization_status
-            ) VALUES (
-                %(run_id)s, %(run_timestamp)s, %(run_name)s,
-                %(total_cost)s, %(electricity_cost)s, %(water_cost)s,
-                %(baseline_cost)s, %(cost_savings)s, %(cost_savings_percent)s,
-                %(total_water_usage_gallons)s, %(peak_demand_mw)s,
-                %(water_saved_gallons)s, %(carbon_avoided_tons)s,
-                %(optimization_status)s
-            )
-            """
-
-            cur = self.conn.cursor()
-            cur.execute(summary_query, summary_data)
-
-            # Save hourly details if available
-            if 'hourly_data' in results:
-                for hour_data in results['hourly_data']:
+                # Insert summary
+                summary_query = """
+                INSERT INTO optimization_summary (
+                    run_id, run_timestamp, run_name,
+                    total_cost, electricity_cost, water_cost,
+                    baseline_cost, cost_savings, cost_savings_percent,
+                    total_water_usage_gallons, peak_demand_mw,
+                    water_saved_gallons, carbon_avoided_tons,
+                    optimization_status
+                ) VALUES (
+                    %(run_id)s, %(run_timestamp)s, %(run_name)s,
+                    %(total_cost)s, %(electricity_cost)s, %(water_cost)s,
+                    %(baseline_cost)s, %(cost_savings)s, %(cost_savings_percent)s,
+                    %(total_water_usage_gallons)s, %(peak_demand_mw)s,
+                    %(water_saved_gallons)s, %(carbon_avoided_tons)s,
+                    %(optimization_status)s
+                )
+                """
+
+                cur = conn.cursor()
+                cur.execute(summary_query, summary_data)
+
+                # Save hourly details if available. The columns are sent as
+                # arrays and unnested server-side, so run_id and run_timestamp
+                # go over the wire once instead of once per hour.
+                if results.get('hourly_data'):
                     detail_query = """
                     INSERT INTO optimization_results (
                         run_id, run_timestamp, hour, batch_load_mw, total_load_mw,
                         cooling_mode, water_cooling_active,
                         hourly_cost, electricity_cost, water_cost,
                         water_usage_gallons, temperature_f, electricity_price
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    )
+                    SELECT %(run_id)s::uuid, %(run_timestamp)s, h.*
+                    FROM unnest(
+                        %(hour)s::int[], %(batch_load_mw)s::float8[], %(total_load_mw)s::float8[],
+                        %(cooling_mode)s::text[], %(water_cooling_active)s::boolean[],
+                        %(hourly_cost)s::float8[], %(electricity_cost)s::float8[], %(water_cost)s::float8[],
+                        %(water_usage_gallons)s::float8[], %(temperature_f)s::float8[],
+                        %(electricity_price)s::float8[]
+                    ) AS h
                     """
+                    detail_data = self._prepare_hourly_columns(results['hourly_data'])
+                    cur.execute(detail_query, {'run_id': run_id, 'run_timestamp': run_timestamp, **detail_data})
 
-                    water_cooling = hour_data.get('water_cooling', 0)
-                    elec_cost = hour_data.get('electricity_cost', 0)
-                    water_cost = hour_data.get('water_cost', 0)
-
-                    cur.execute(detail_query, (
-                        run_id,
-                        datetime.now(),  # run_timestamp
-                        hour_data['hour'],
-                        float(hour_data.get('batch_load_mw', 0)),
-                        float(hour_data.get('total_load_mw', 0)),
-                        'water' if water_cooling else 'electric',
-                        bool(water_cooling),  # water_cooling_active
-                        float(elec_cost + water_cost),  # hourly_cost
-                        float(elec_cost),  # electricity_cost
-                        float(water_cost),  # water_cost
-                        float(water_cooling * 120),  # water_usage_gallons
-                        float(hour_data.get('temperature', 0)),
-                        float(hour_data.get('electricity_price', 0))
-                    ))
-
-            self.conn.commit()
-            cur.close()
-
-            return run_id
+                conn.commit()
+                cur.close()
 
-        except Exception as e:
-            print(f"Error saving optimization results: {e}")
-            if self.conn:
-                self.conn.rollback()
-            return None
+                return run_id
+
+            except Exception as e:
+                print(f"Error saving optimization results: {e}")
+                if not conn.closed:
+                    conn.rollback()
+                return None
+
+    def _prepare_hourly_columns(self, hourly_data: List[Dict]) -> Dict[str, List]:
+        """Build optimization_results columns from the hourly result dicts."""
+        df = pd.DataFrame(hourly_data)
+        zeros = pd.Series(0.0, index=df.index)
+
+        def column(name):
+            return df.get(name, zeros).fillna(0).astype(float)
+
+        water_cooling = column('water_cooling')
+        elec_cost = column('electricity_cost')
+        water_cost = column('water_cost')
+
+        return {
+            'hour': df['hour'].tolist(),
+            'batch_load_mw': column('batch_load_mw').tolist(),
+            'total_load_mw': column('total_load_mw').tolist(),
+            'cooling_mode': np.where(water_cooling != 0, 'water', 'electric').tolist(),
+            'water_cooling_active': (water_cooling != 0).tolist(),
+            'hourly_cost': (elec_cost + water_cost).tolist(),
+            'electricity_cost': elec_cost.tolist(),
+            'water_cost': water_cost.tolist(),
+            'water_usage_gallons': (water_cooling * 120).tolist(),
+            'temperature_f': column('temperature').tolist(),
+            'electricity_price': column('electricity_price').tolist()
+        }
 
     def get_optimization_history(self, limit: int = 10) -> pd.DataFrame:
         """
@@ -399,32 +481,31 @@ class SupabaseInterface:
         Returns:
             DataFrame with optimization history
         """
-        self.ensure_connection()
-
-        try:
-            query = """
-            SELECT
-                run_id,
-                run_timestamp,
-                run_name,
-                total_cost,
-                cost_savings,
-                cost_savings_percent,
-                total_water_usage_gallons,
-                peak_demand_mw,
-                carbon_avoided_tons,
-                optimization_status
-            FROM optimization_summary
-            ORDER BY run_timestamp DESC
-            LIMIT %s
-            """
-
-            df = pd.read_sql_query(query, self.conn, params=(limit,))
-            return df
-
-        except Exception as e:
-            print(f"Error fetching optimization history: {e}")
-            return pd.DataFrame()
+        with get_conn() as conn:
+            try:
+                query = """
+                SELECT
+                    run_id,
+                    run_timestamp,
+                    run_name,
+                    total_cost,
+                    cost_savings,
+                    cost_savings_percent,
+                    total_water_usage_gallons,
+                    peak_demand_mw,
+                    carbon_avoided_tons,
+                    optimization_status
+                FROM optimization_summary
+                ORDER BY run_timestamp DESC
+                LIMIT %s
+                """
+
+                df = pd.read_sql_query(query, conn, params=(limit,))
+                return df
+
+            except Exception as e:
+                print(f"Error fetching optimization history: {e}")
+                return pd.DataFrame()
 
     def get_period_summary(self, days: int) -> Dict:
         """
@@ -436,63 +517,62 @@ class SupabaseInterface:
         Returns:
             Dictionary with period statistics
         """
-        self.ensure_connection()
-
-        try:
-            query = """
-            SELECT
-                COUNT(*) as runs,
-                SUM(cost_savings) as total_savings,
-                AVG(cost_savings) as avg_daily_savings,
-                AVG(cost_savings_percent) as avg_savings_percent,
-                SUM(total_water_usage_gallons) as total_water_usage,
-                AVG(total_water_usage_gallons) as avg_water_usage,
-                MAX(peak_demand_mw) as max_peak_demand,
-                AVG(peak_demand_mw) as avg_peak_demand,
-                SUM(carbon_avoided_tons) as total_carbon_avoided
-            FROM optimization_summary
-            WHERE run_timestamp >= CURRENT_DATE - INTERVAL '%s days'
-                AND optimization_status = 'completed'
-            """
-
-            cur = self.conn.cursor(cursor_factory=RealDictCursor)
-            cur.execute(query, (days,))
-            result = cur.fetchone()
-            cur.close()
-
-            if result and result['runs'] > 0:
-                # Check if we need to project
-                actual_days = result['runs']
-                is_projection = actual_days < days
-
-                if is_projection:
-                    # Project values to full period
-                    projection_factor = days / actual_days
-                    total_savings = float(result['avg_daily_savings'] or 0) * days
-                    total_water = float(result['avg_water_usage'] or 0) * days
-                else:
-                    total_savings = float(result['total_savings'] or 0)
-                    total_water = float(result['total_water_usage'] or 0)
-
-                return {
-                    'days_analyzed': days,
-                    'actual_days_with_data': actual_days,
-                    'is_projection': is_projection,
-                    'total_savings': total_savings,
-                    'avg_daily_savings': float(result['avg_daily_savings'] or 0),
-                    'avg_savings_percent': float(result['avg_savings_percent'] or 0),
-                    'total_water_usage': total_water,
-                    'avg_water_usage': float(result['avg_water_usage'] or 0),
-                    'max_peak_demand': float(result['max_peak_demand'] or 0),
-                    'avg_peak_demand': float(result['avg_peak_demand'] or 0),
-                    'total_carbon_avoided': float(result['total_carbon_avoided'] or 0) * (projection_factor if is_projection else 1)
-                }
-
-            return {'total_savings': 0}
+        with get_conn() as conn:
+            try:
+                query = """
+                SELECT
+                    COUNT(*) as runs,
+                    SUM(cost_savings) as total_savings,
+                    AVG(cost_savings) as avg_daily_savings,
+                    AVG(cost_savings_percent) as avg_savings_percent,
+                    SUM(total_water_usage_gallons) as total_water_usage,
+                    AVG(total_water_usage_gallons) as avg_water_usage,
+                    MAX(peak_demand_mw) as max_peak_demand,
+                    AVG(peak_demand_mw) as avg_peak_demand,
+                    SUM(carbon_avoided_tons) as total_carbon_avoided
+                FROM optimization_summary
+                WHERE run_timestamp >= CURRENT_DATE - INTERVAL '%s days'
+                    AND optimization_status = 'completed'
+                """
+
+                cur = conn.cursor(cursor_factory=RealDictCursor)
+                cur.execute(query, (days,))
+                result = cur.fetchone()
+                cur.close()
 
-        except Exception as e:
-            print(f"Error getting period summary: {e}")
-            return {'total_savings': 0}
+                if result and result['runs'] > 0:
+                    # Check if we need to project
+                    actual_days = result['runs']
+                    is_projection = actual_days < days
+
+                    if is_projection:
+                        # Project values to full period
+                        projection_factor = days / actual_days
+                        total_savings = float(result['avg_daily_savings'] or 0) * days
+                        total_water = float(result['avg_water_usage'] or 0) * days
+                    else:
+                        total_savings = float(result['total_savings'] or 0)
+                        total_water = float(result['total_water_usage'] or 0)
+
+                    return {
+                        'days_analyzed': days,
+                        'actual_days_with_data': actual_days,
+                        'is_projection': is_projection,
+                        'total_savings': total_savings,
+                        'avg_daily_savings': float(result['avg_daily_savings'] or 0),
+                        'avg_savings_percent': float(result['avg_savings_percent'] or 0),
+                        'total_water_usage': total_water,
+                        'avg_water_usage': float(result['avg_water_usage'] or 0),
+                        'max_peak_demand': float(result['max_peak_demand'] or 0),
+                        'avg_peak_demand': float(result['avg_peak_demand'] or 0),
+                        'total_carbon_avoided': float(result['total_carbon_avoided'] or 0) * (projection_factor if is_projection else 1)
+                    }
+
+                return {**_EMPTY_PERIOD_SUMMARY, 'days_analyzed': days}
+
+            except Exception as e:
+                print(f"Error getting period summary: {e}")
+                return {**_EMPTY_PERIOD_SUMMARY, 'days_analyzed': days}
 
     def get_monthly_breakdown(self, months: int = 6) -> pd.DataFrame:
         """
@@ -504,30 +584,29 @@ class SupabaseInterface:
         Returns:
             DataFrame with monthly statistics
         """
-        self.ensure_connection()
-
-        try:
-            query = """
-            SELECT
-                DATE_TRUNC('month', run_timestamp) as month,
-                COUNT(*) as runs,
-                SUM(cost_savings) as cost_savings,
-                AVG(cost_savings_percent) as avg_savings_percent,
-                SUM(total_water_usage_gallons) as water_usage,
-                AVG(peak_demand_mw) as avg_peak_demand
-            FROM optimization_summary
-            WHERE run_timestamp >= CURRENT_DATE - INTERVAL '%s months'
-                AND optimization_status = 'completed'
-            GROUP BY DATE_TRUNC('month', run_timestamp)
-            ORDER BY month DESC
-            """
-
-            df = pd.read_sql_query(query, self.conn, params=(months,))
-            return df
-
-        except Exception as e:
-            print(f"Error getting monthly breakdown: {e}")
-            return pd.DataFrame()
+        with get_conn() as conn:
+            try:
+                query = """
+                SELECT
+                    DATE_TRUNC('month', run_timestamp) as month,
+                    COUNT(*) as runs,
+                    SUM(cost_savings) as cost_savings,
+                    AVG(cost_savings_percent) as avg_savings_percent,
+                    SUM(total_water_usage_gallons) as water_usage,
+                    AVG(peak_demand_mw) as avg_peak_demand
+                FROM optimization_summary
+                WHERE run_timestamp >= CURRENT_DATE - INTERVAL '%s months'
+                    AND optimization_status = 'completed'
+                GROUP BY DATE_TRUNC('month', run_timestamp)
+                ORDER BY month DESC
+                """
+
+                df = pd.read_sql_query(query, conn, params=(months,))
+                return df
+
+            except Exception as e:
+                print(f"Error getting monthly breakdown: {e}")
+                return pd.DataFrame()
 
     def get_daily_trends(self, days: int = 30) -> Dict:
         """
@@ -539,50 +618,41 @@ class SupabaseInterface:
         Returns:
             Dictionary with trend data
         """
-        self.ensure_connection()
+        with get_conn() as conn:
+            try:
+                query = """
+                SELECT
+                    DATE(run_timestamp) as date,
+                    AVG(cost_savings) as daily_savings,
+                    AVG(total_water_usage_gallons) as water_usage,
+                    AVG(peak_demand_mw) as peak_demand
+                FROM optimization_summary
+                WHERE run_timestamp >= CURRENT_DATE - INTERVAL '%s days'
+                    AND optimization_status = 'completed'
+                GROUP BY DATE(run_timestamp)
+                ORDER BY date
+                """
+
+                cur = conn.cursor()
+                cur.execute(query, (days,))
+                results = cur.fetchall()
+                cur.close()
 
-        try:
-            query = """
-            SELECT
-                DATE(run_timestamp) as date,
-                AVG(cost_savings) as daily_savings,
-                AVG(total_water_usage_gallons) as water_usage,
-                AVG(peak_demand_mw) as peak_demand
-            FROM optimization_summary
-            WHERE run_timestamp >= CURRENT_DATE - INTERVAL '%s days'
-                AND optimization_status = 'completed'
-            GROUP BY DATE(run_timestamp)
-            ORDER BY date
-            """
-
-            cur = self.conn.cursor()
-            cur.execute(query, (days,))
-            results = cur.fetchall()
-            cur.close()
-
-            if results:
-                dates = [row[0] for row in results]
-                savings = [float(row[1] or 0) for row in results]
-                water = [float(row[2] or 0) for row in results]
-                peak = [float(row[3] or 0) for row in results]
-
-                return {
-                    'dates': dates,
-                    'savings': savings,
-                    'water_usage': water,
-                    'peak_demand': peak
-                }
+                if results:
+                    dates = [row[0] for row in results]
+                    savings = [float(row[1] or 0) for row in results]
+                    water = [float(row[2] or 0) for row in results]
+                    peak = [float(row[3] or 0) for row in results]
 
-            return {'dates': [], 'savings': [], 'water_usage': [], 'peak_demand': []}
+                    return {
+                        'dates': dates,
+                        'savings': savings,
+                        'water_usage': water,
+                        'peak_demand': peak
+                    }
 
-        except Exception as e:
-            print(f"Error getting daily trends: {e}")
-            return {'dates': [], 'savings': [], 'water_usage': [], 'peak_demand': []}
+                return {'dates': [], 'savings': [], 'water_usage': [], 'peak_demand': []}
 
-    def __del__(self):
-        """Clean up database connection."""
-        if self.conn:
-            try:
-                self.conn.close()
-            except:
-                pass
\ No newline at end of file
+            except Exception as e:
+                print(f"Error getting daily trends: {e}")
+                return {'dates': [], 'savings': [], 'water_usage': [], 'peak_demand': []}
@@ -142,8 +142,8 @@ def main():
         try:
             results = optimizer.solve(solver_name='glpk', time_limit=300)
             print("Optimization completed with GLPK solver!")
-        except:
-            print("ERROR: Could not solve optimization. Please check solver installation.")
+        except Exception as e:
+            print(f"ERROR: Could not solve optimization ({e}). Please check solver installation.")
             sys.exit(1)
 
     # Display results
@@ -194,28 +194,23 @@ def main():
 def create_demo_data():
     """Create demonstration data for testing."""
     # Create realistic Phoenix summer day temperatures
-    hours = list(range(24))
-    temperatures = []
-    for h in hours:
-        base = 95
-        amplitude = 15
-        phase = (h - 5) * np.pi / 12
-        temp = base + amplitude * np.sin(phase - np.pi/2)
-        temp += np.random.uniform(-2, 2)
-        temperatures.append(max(75, min(118, temp)))
-
-    # Create time-of-use electricity prices (APS schedule)
-    prices = []
-    for h in hours:
-        if 15 <= h < 20:  # Peak hours 3-8 PM
-            price = np.random.uniform(140, 160)  # $/MWh
-        elif 22 <= h or h < 6:  # Super off-peak
-            price = np.random.uniform(30, 40)
-        else:  # Off-peak
-            price = np.random.uniform(50, 70)
-        prices.append(price)
-
-    return prices, temperatures
+    hours = np.arange(24)
+    base = 95
+    amplitude = 15
+    phase = (hours - 5) * np.pi / 12
+    temperatures = base + amplitude * np.sin(phase - np.pi/2)
+    temperatures += np.random.uniform(-2, 2, size=24)
+    temperatures = np.clip(temperatures, 75, 118)
+
+    # Create time-of-use electricity prices (APS schedule), one draw per hour
+    # from that hour's band
+    peak = (hours >= 15) & (hours < 20)  # Peak hours 3-8 PM
+    super_off_peak = (hours >= 22) | (hours < 6)  # Super off-peak
+    low = np.select([peak, super_off_peak], [140, 30], default=50)  # $/MWh
+    high = np.select([peak, super_off_peak], [160, 40], default=70)
+    prices = np.random.uniform(low, high)
+
+    return prices.tolist(), temperatures.tolist()
 
 
 if __name__ == "__main__":
@@ -22,6 +22,14 @@ except ImportError:
     SUPABASE_AVAILABLE = False
     print("Supabase interface not available, using fallback data sources")
 
+# Common NOAA column names, matched as substrings of the CSV header
+NOAA_TEMP_COLUMNS = ('HourlyDryBulbTemperature', 'TEMP', 'Temperature',
+                     'DryBulbTemp', 'temperature', 'temp_f')
+
+
+def _is_noaa_temp_column(col: str) -> bool:
+    return any(t in col for t in NOAA_TEMP_COLUMNS)
+
 
 class DataInterface:
     """
@@ -41,6 +49,12 @@ class DataInterface:
         self.offpeak_rate = 0.05  # $/kWh off-peak summer
         self.super_offpeak_rate = 0.03  # $/kWh night rate
 
+        # Fallback TOU schedule in $/MWh, built once for _generate_tou_prices
+        hours = np.arange(24)
+        self._tou_template = np.full(24, 35)  # Off-peak
+        self._tou_template[(hours >= 22) | (hours < 6)] = 25  # Super off-peak
+        self._tou_template[self.peak_hours] = 150  # Peak: 3-8 PM
+
         # Default Phoenix summer temperature pattern if needed
         self.default_temp_pattern = self._generate_phoenix_pattern()
 
@@ -130,7 +144,8 @@ class DataInterface:
         # Handle different input types
         if isinstance(data_source, str):
             if data_source.endswith('.csv'):
-                df = pd.read_csv(data_source)
+                # NOAA exports carry 100+ columns; only parse the temperature ones
+                df = pd.read_csv(data_source, usecols=_is_noaa_temp_column)
                 temperatures = self._parse_noaa_csv(df)
             elif data_source.endswith('.json'):
                 with open(data_source, 'r') as f:
@@ -210,12 +225,8 @@ class DataInterface:
         """Parse NOAA CSV format."""
         temperatures = []
 
-        # Common NOAA column names
-        temp_cols = ['HourlyDryBulbTemperature', 'TEMP', 'Temperature',
-                    'DryBulbTemp', 'temperature', 'temp_f']
-
         for col in df.columns:
-            if any(t in col for t in temp_cols):
+            if _is_noaa_temp_column(col):
                 temperatures = df[col].tolist()
                 break
 
@@ -286,35 +297,20 @@ class DataInterface:
     def _generate_tou_prices(self) -> List[float]:
         """Generate simple time-of-use prices as fallback."""
         # Simple TOU rates without variation
-        prices = []
-        for h in range(24):
-            if h in self.peak_hours:  # Peak: 3-8 PM
-                price = 150  # $/MWh
-            elif h in range(22, 24) or h in range(0, 6):  # Super off-peak
-                price = 25  # $/MWh
-            else:  # Off-peak
-                price = 35  # $/MWh
-
-            prices.append(price)
-
-        return prices
+        return self._tou_template.tolist()
 
     def _generate_phoenix_pattern(self) -> List[float]:
         """Generate typical Phoenix summer temperature pattern."""
         # Phoenix July average: Low 84°F at 5 AM, High 106°F at 5 PM
-        temperatures = []
-        for h in range(24):
-            # Sine wave pattern
-            base = 95  # Average temperature
-            amplitude = 15  # Half of daily range
-            phase = (h - 5) * np.pi / 12  # Minimum at 5 AM
-            temp = base + amplitude * np.sin(phase - np.pi/2)
-
-            # Add slight random variation
-            temp += np.random.uniform(-2, 2)
-            temperatures.append(max(75, min(120, temp)))  # Cap at reasonable limits
-
-        return temperatures
+        # Sine wave pattern
+        base = 95  # Average temperature
+        amplitude = 15  # Half of daily range
+        phase = (np.arange(24) - 5) * np.pi / 12  # Minimum at 5 AM
+        temps = base + amplitude * np.sin(phase - np.pi/2)
+
+        # Add slight random variation
+        temps += np.random.uniform(-2, 2, size=24)
+        return np.clip(temps, 75, 120).tolist()  # Cap at reasonable limits
 
     def _ensure_24_hours(self, data: List) -> List:
         """Ensure we have exactly 24 hours of data."""
@@ -11,7 +11,9 @@ CREATE TABLE IF NOT EXISTS weather_data (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX IF NOT EXISTS idx_weather_timestamp ON weather_data(timestamp);
+-- Covers the hourly temperature averages (timestamp range, AVG(temperature_f))
+-- so they are answered from the index alone
+CREATE INDEX IF NOT EXISTS idx_weather_timestamp_temp ON weather_data(timestamp) INCLUDE (temperature_f);
 CREATE INDEX IF NOT EXISTS idx_weather_date ON weather_data(DATE(timestamp));
 
 -- 2. Electricity Prices Table
@@ -62,6 +64,7 @@ CREATE TABLE IF NOT EXISTS optimization_summary (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Range scans for the period/monthly/daily summaries (run_timestamp >= ...)
 CREATE INDEX IF NOT EXISTS idx_opt_summary_timestamp ON optimization_summary(run_timestamp DESC);
 CREATE INDEX IF NOT EXISTS idx_opt_summary_status ON optimization_summary(optimization_status);
 
@@ -3,9 +3,12 @@ import os
 import sys
 import argparse
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,6 +17,17 @@ BASE_URL = "https://api.eia.gov/v2/electricity/rto/interchange-data/data/"
 PAGE_SIZE = 5000  # EIA v2 max per request
 AZ_BAS = ["AZPS", "SRP", "TEPC"]
 
+# One keep-alive session for every page of both dimensions, retrying
+# transient API failures before giving up.
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_maxsize=2,  # fromba and toba pages are fetched concurrently
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+    ),
+)
+
 
 def _fetch_for_dimension(
     api_key: str,
@@ -29,29 +43,30 @@ def _fetch_for_dimension(
     offset = 0
     page = 1
 
-    while True:
-        print(f"[fetch_eia] ---- {dim.upper()} Page {page} (offset={offset}) ----")
+    # Everything except the offset is the same for every page
+    base_params = [
+        ("api_key", api_key),
+        ("frequency", "hourly"),
+        ("data[0]", "value"),
+        ("start", start_str),
+        ("end", end_str),
+        ("sort[0][column]", "period"),
+        ("sort[0][direction]", "asc"),
+        ("length", PAGE_SIZE),
+    ]
 
-        params = [
-            ("api_key", api_key),
-            ("frequency", "hourly"),
-            ("data[0]", "value"),
-            ("start", start_str),
-            ("end", end_str),
-            ("sort[0][column]", "period"),
-            ("sort[0][direction]", "asc"),
-            ("offset", offset),
-            ("length", PAGE_SIZE),
-        ]
+    if state:
+        base_params.append(("facets[state][]", state))
 
-        if state:
-            params.append(("facets[state][]", state))
+    base_params.extend((f"facets[{dim}][]", ba) for ba in AZ_BAS)
 
-        for ba in AZ_BAS:
-            params.append((f"facets[{dim}][]", ba))
+    while True:
+        print(f"[fetch_eia] ---- {dim.upper()} Page {page} (offset={offset}) ----")
+
+        params = [*base_params, ("offset", offset)]
 
         try:
-            resp = requests.get(BASE_URL, params=params, timeout=20)
+            resp = SESSION.get(BASE_URL, params=params, timeout=20)
             resp.raise_for_status()
         except Exception as e:
             print(f"[fetch_eia] Request error ({dim}, offset={offset}): {e}")
@@ -130,23 +145,22 @@ def fetch_period(
     expected = 24 * days
     print(f"[fetch_eia] Expected ~{expected} hourly timestamps for {days} day(s)")
 
-    # Fetch where AZ BAs appear as FROM
-    from_records = _fetch_for_dimension(
-        api_key=api_key,
-        start_str=start_str,
-        end_str=end_str,
-        dim="fromba",
-        state=state,
-    )
-
-    # Fetch where AZ BAs appear as TO
-    to_records = _fetch_for_dimension(
-        api_key=api_key,
-        start_str=start_str,
-        end_str=end_str,
-        dim="toba",
-        state=state,
-    )
+    # Fetch where AZ BAs appear as FROM and as TO; the two sides are
+    # independent queries, so they run concurrently.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        from_future, to_future = (
+            pool.submit(
+                _fetch_for_dimension,
+                api_key=api_key,
+                start_str=start_str,
+                end_str=end_str,
+                dim=dim,
+                state=state,
+            )
+            for dim in ("fromba", "toba")
+        )
+        from_records = from_future.result()
+        to_records = to_future.result()
 
     print(
         f"[fetch_eia] Raw counts before dedupe: "
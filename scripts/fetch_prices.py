@@ -2,9 +2,13 @@
 import os
 import sys
 import argparse
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from psycopg2.extras import execute_values
 from dotenv import load_dotenv
 
@@ -20,6 +24,19 @@ load_dotenv()
 
 PRICE_URL = "https://api.eia.gov/v2/electricity/retail-sales/data/"
 PAGE_SIZE = 5000
+INSERT_PAGE_SIZE = 1000  # rows per INSERT statement in save_prices
+MAX_WORKERS = 8  # concurrent page requests once the row total is known
+
+# One keep-alive session for all pages, retrying transient API failures.
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=MAX_WORKERS,
+        pool_maxsize=MAX_WORKERS,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+    ),
+)
 
 
 def month_range(start: datetime, days: int):
@@ -27,68 +44,92 @@ def month_range(start: datetime, days: int):
     Convert (start_date, days) into a list of YYYY-MM months.
     """
     end = start + timedelta(days=days - 1)
-    months = set()
 
-    curr = datetime(start.year, start.month, 1)
-    last = datetime(end.year, end.month, 1)
+    # Count months from year 0 so the span is a plain integer range.
+    first = start.year * 12 + start.month - 1
+    last = end.year * 12 + end.month - 1
 
-    while curr <= last:
-        months.add(curr.strftime("%Y-%m"))
-        # move to next month
-        if curr.month == 12:
-            curr = datetime(curr.year + 1, 1, 1)
-        else:
-            curr = datetime(curr.year, curr.month + 1, 1)
-    return sorted(months)
+    return [f"{m // 12:04d}-{m % 12 + 1:02d}" for m in range(first, last + 1)]
 
 
-def fetch_az_prices(api_key: str) -> list[dict]:
-    """
-    Fetch ALL AZ price data (only monthly available).
-    """
-    all_records: list[dict] = []
-    offset = 0
-    page = 1
-
-    while True:
-        print(f"[fetch_prices] Page {page} offset={offset}")
-
-        params = [
-            ("api_key", api_key),
-            ("frequency", "monthly"),
-            ("data[0]", "price"),
-            ("facets[stateid][]", "AZ"),
-            ("facets[sectorid][]", "ALL"),
-            ("offset", offset),
-            ("length", PAGE_SIZE),
-        ]
-
-        resp = requests.get(PRICE_URL, params=params, timeout=20)
-        resp.raise_for_status()
-        data = resp.json()
-
-        records = (
-            data.get("response", {}).get("data")
-            or data.get("data")
-            or data.get("results")
-        )
+def _fetch_price_page(api_key: str, offset: int, window: list) -> dict:
+    print(f"[fetch_prices] Page {offset // PAGE_SIZE + 1} offset={offset}")
+
+    params = [
+        ("api_key", api_key),
+        ("frequency", "monthly"),
+        ("data[0]", "price"),
+        ("facets[stateid][]", "AZ"),
+        ("facets[sectorid][]", "ALL"),
+        *window,
+        ("offset", offset),
+        ("length", PAGE_SIZE),
+    ]
 
-        if not records:
-            break
+    resp = SESSION.get(PRICE_URL, params=params, timeout=20)
+    resp.raise_for_status()
+    return resp.json()
 
-        all_records.extend(records)
 
-        if len(records) < PAGE_SIZE:
-            break
+def _page_records(data: dict) -> list[dict]:
+    return (
+        data.get("response", {}).get("data")
+        or data.get("data")
+        or data.get("results")
+        or []
+    )
 
-        offset += PAGE_SIZE
-        page += 1
+
+def fetch_az_prices(
+    api_key: str,
+    start_month: str | None = None,
+    end_month: str | None = None,
+) -> list[dict]:
+    """
+    Fetch AZ price data (only monthly available), optionally limited to the
+    YYYY-MM window [start_month, end_month] by the API itself.
+
+    The first page reports the total row count, so any remaining pages are
+    requested concurrently rather than one after another.
+    """
+    window = []
+    if start_month:
+        window.append(("start", start_month))
+    if end_month:
+        window.append(("end", end_month))
+
+    first = _fetch_price_page(api_key, 0, window)
+    all_records = _page_records(first)
+
+    if len(all_records) == PAGE_SIZE:
+        total = int(first.get("response", {}).get("total") or 0)
+        if total:
+            # Empty when total <= PAGE_SIZE: the first page already had it all
+            offsets = range(PAGE_SIZE, total, PAGE_SIZE)
+            if offsets:
+                with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(offsets))) as pool:
+                    pages = pool.map(lambda offset: _page_records(_fetch_price_page(api_key, offset, window)), offsets)
+                    for records in pages:
+                        all_records.extend(records)
+        else:
+            # No usable total in the response: page sequentially until a short page
+            offset = PAGE_SIZE
+            while True:
+                records = _page_records(_fetch_price_page(api_key, offset, window))
+                all_records.extend(records)
+                if len(records) < PAGE_SIZE:
+                    break
+                offset += PAGE_SIZE
 
     print(f"[fetch_prices] Total rows fetched: {len(all_records)}")
     return all_records
 
 
 def save_prices(records: list[dict]):
+    if not records:
+        print("[fetch_prices] No price rows to insert.")
+        return
+
     conn = connect_db()
     cur = conn.cursor()
 
@@ -103,12 +144,10 @@ def save_prices(records: list[dict]):
         )
     """
     cur.execute(create_sql)
-    conn.commit()
 
     rows = []
     for r in records:
-        period_month_str = r["period"] + "-01"
-        period_month = datetime.strptime(period_month_str, "%Y-%m-%d").date()
+        period_month = date.fromisoformat(r["period"] + "-01")
 
         price_cents = float(r["price"])
         price_per_mwh = price_cents / 100.0 * 1000.0
@@ -130,7 +169,22 @@ def save_prices(records: list[dict]):
         VALUES %s
     """
 
-    execute_values(cur, insert_sql, rows)
+    # The table has no unique key to upsert on, so re-running over the same
+    # months replaces their rows instead of appending duplicates. Setup, the
+    # delete and all pages of the insert commit together, so a failed run
+    # leaves the previous data in place.
+    keys = {row[:3] for row in rows}
+    cur.execute(
+        """
+        DELETE FROM eia_az_price t
+        USING unnest(%s::date[], %s::text[], %s::text[]) AS k(period_month, stateid, sectorid)
+        WHERE t.period_month = k.period_month
+          AND t.stateid IS NOT DISTINCT FROM k.stateid
+          AND t.sectorid IS NOT DISTINCT FROM k.sectorid
+        """,
+        [list(col) for col in zip(*keys)],
+    )
+    execute_values(cur, insert_sql, rows, page_size=INSERT_PAGE_SIZE)
     conn.commit()
     cur.close()
     conn.close()
@@ -161,17 +215,14 @@ def main():
         sys.exit(1)
 
     months_needed = month_range(start, args.days)
+    if not months_needed:
+        print(f"[fetch_prices] No months in a {args.days}-day window, nothing to fetch.")
+        return
 
-    # Fetch all AZ price data
-    all_price_rows = fetch_az_prices(api_key)
-
-    # Filter to only the months inside user's range
-    filtered = [
-        r for r in all_price_rows
-        if r["period"] in months_needed
-    ]
+    # Fetch only the months inside user's range; the API applies the window
+    filtered = fetch_az_prices(api_key, months_needed[0], months_needed[-1])
 
-    print(f"[fetch_prices] Filtered to {len(filtered)} rows for months: {months_needed}")
+    print(f"[fetch_prices] Fetched {len(filtered)} rows for months: {months_needed}")
 
     if args.pretty:
         import json
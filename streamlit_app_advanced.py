@@ -198,7 +198,7 @@ if display_mode == "daily":
                         run_id = optimizer.save_results_to_supabase()
                         if run_id:
                             st.info(f"💾 Results saved to Supabase (Run ID: {run_id})")
-                    except:
+                    except Exception:
                         pass
 
             # Store in session state
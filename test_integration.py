@@ -62,7 +62,7 @@ def test_basic_functionality():
                 print(f"   ✅ Solver '{solver}' is available")
                 solver_found = True
                 break
-        except:
+        except Exception:
             pass
 
     if not solver_found:
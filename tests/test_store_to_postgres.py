@@ -0,0 +1,29 @@
+"""
+COPY buffer tests for store_to_postgres (no database needed)
+"""
+
+import csv
+from datetime import datetime
+
+from data.api.store_to_postgres import _copy_csv_buffer
+
+
+def test_none_is_unquoted_null_marker():
+    assert _copy_csv_buffer([(1, None, "AZPS")]).getvalue() == '"1",\\N,"AZPS"\n'
+
+
+def test_empty_string_stays_quoted():
+    assert _copy_csv_buffer([("", None)]).getvalue() == '"",\\N\n'
+
+
+def test_literal_null_marker_string_is_quoted():
+    assert _copy_csv_buffer([("\\N",)]).getvalue() == '"\\N"\n'
+
+
+def test_commas_quotes_and_newlines_round_trip():
+    row = ("Salt River Project, AZ", 'the "big" one', "two\nlines", 42,
+           datetime(2024, 8, 1, 13))
+
+    parsed = list(csv.reader(_copy_csv_buffer([row, row])))
+
+    assert parsed == [[str(v) for v in row]] * 2
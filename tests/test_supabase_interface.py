@@ -0,0 +1,153 @@
+"""
+SupabaseInterface tests that need no database: weather gap filling and the
+hourly result columns sent to optimization_results
+"""
+
+import re
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+import data.supabase_interface as supabase_interface
+from data.supabase_interface import SupabaseInterface
+
+DATE = datetime(2024, 7, 15)
+
+
+def _interface(monkeypatch, hourly):
+    """SupabaseInterface that skips connecting and returns `hourly` for DATE."""
+    interface = SupabaseInterface.__new__(SupabaseInterface)
+    monkeypatch.setattr(
+        interface, 'fetch_weather_data_range',
+        lambda start, end: {DATE.date(): hourly} if hourly else {}
+    )
+    return interface
+
+
+def _pattern(interface, hours=24):
+    np.random.seed(0)
+    return interface._generate_phoenix_pattern(DATE, hours)
+
+
+def test_measured_hours_keep_their_position(monkeypatch):
+    interface = _interface(monkeypatch, {3: 90.0, 4: 92.0, 5: 94.0})
+    expected = _pattern(interface)
+
+    np.random.seed(0)
+    temps = interface.fetch_weather_data(DATE)
+
+    assert len(temps) == 24
+    assert temps[3:6] == [90.0, 92.0, 94.0]
+    # Outside the measured span the Phoenix pattern is used
+    assert temps[:3] == expected[:3]
+    assert temps[6:] == expected[6:]
+
+
+def test_gaps_between_readings_are_interpolated(monkeypatch):
+    interface = _interface(monkeypatch, {10: 90.0, 14: 100.0})
+
+    temps = interface.fetch_weather_data(DATE)
+
+    assert temps[10:15] == pytest.approx([90.0, 92.5, 95.0, 97.5, 100.0])
+
+
+def test_partial_day_keeps_afternoon_peak(monkeypatch):
+    interface = _interface(monkeypatch, {0: 80.0, 1: 79.0})
+    expected = _pattern(interface)
+
+    np.random.seed(0)
+    temps = interface.fetch_weather_data(DATE)
+
+    assert temps[:2] == [80.0, 79.0]
+    assert temps[15] == expected[15]
+    assert max(temps) > 100
+
+
+def test_no_readings_falls_back_to_pattern(monkeypatch):
+    interface = _interface(monkeypatch, {})
+    expected = _pattern(interface, hours=12)
+
+    np.random.seed(0)
+    assert interface.fetch_weather_data(DATE, hours=12) == expected
+
+
+class _RecordingCursor:
+    def __init__(self, executed):
+        self.executed = executed
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+
+    def close(self):
+        pass
+
+
+class _RecordingConnection:
+    closed = 0
+
+    def __init__(self):
+        self.executed = []
+
+    def cursor(self):
+        return _RecordingCursor(self.executed)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def test_hourly_columns_fill_missing_and_none_with_zero():
+    interface = SupabaseInterface.__new__(SupabaseInterface)
+
+    columns = interface._prepare_hourly_columns([
+        {'hour': 0, 'batch_load_mw': 10.0, 'water_cooling': 1,
+         'electricity_cost': 5.0, 'water_cost': 2.0, 'temperature': 95.0},
+        {'hour': 1, 'batch_load_mw': None, 'water_cooling': None,
+         'electricity_cost': 4.0, 'water_cost': None},
+    ])
+
+    assert columns['hour'] == [0, 1]
+    assert columns['batch_load_mw'] == [10.0, 0.0]
+    assert columns['total_load_mw'] == [0.0, 0.0]
+    assert columns['cooling_mode'] == ['water', 'electric']
+    assert columns['water_cooling_active'] == [True, False]
+    assert columns['hourly_cost'] == [7.0, 4.0]
+    assert columns['water_cost'] == [2.0, 0.0]
+    assert columns['water_usage_gallons'] == [120.0, 0.0]
+    assert columns['temperature_f'] == [95.0, 0.0]
+    assert columns['electricity_price'] == [0.0, 0.0]
+
+
+def test_hourly_columns_match_insert_column_order(monkeypatch):
+    conn = _RecordingConnection()
+
+    @contextmanager
+    def fake_get_conn():
+        yield conn
+
+    monkeypatch.setattr(supabase_interface, 'get_conn', fake_get_conn)
+    interface = SupabaseInterface.__new__(SupabaseInterface)
+
+    run_id = interface.save_optimization_results(
+        {'hourly_data': [{'hour': 0, 'water_cooling': 1}]}
+    )
+
+    assert run_id is not None
+    query, params = next(
+        (q, p) for q, p in conn.executed if 'INSERT INTO optimization_results' in q
+    )
+    insert_columns = re.findall(
+        r'\w+', re.search(r'optimization_results \((.*?)\)', query, re.S).group(1)
+    )
+    unnest_params = re.findall(
+        r'%\((\w+)\)s', re.search(r'unnest\((.*)\) AS h', query, re.S).group(1)
+    )
+    columns = interface._prepare_hourly_columns([{'hour': 0}])
+
+    assert insert_columns[:2] == ['run_id', 'run_timestamp']
+    assert insert_columns[2:] == unnest_params == list(columns)
+    assert params['run_id'] == run_id